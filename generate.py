@@ -1,11 +1,22 @@
 import os
+import atexit
 import base64
 import olxcleaner
 import pkg_resources
 import shutil
 import tarfile
 import logging
+import logging.handlers
 import json
+import queue
+import time
+import datetime
+import csv
+import itertools
+import hashlib
+import uuid
+
+import numpy as np
 
 from path import Path as path
 from random import randint
@@ -15,8 +26,10 @@ from django.conf import settings
 from django.core.exceptions import SuspiciousOperation
 from django.contrib.auth import get_user_model
 from django.db import IntegrityError
+from django.db.models import Q
 
 from organizations.models import Organization
+from opaque_keys.edx.locator import CourseLocator
 
 from openedx.core.lib.extract_archive import safe_extractall
 
@@ -34,7 +47,7 @@ from xmodule.modulestore.exceptions import (
 
 from xmodule.contentstore.django import contentstore
 
-from openedx_tagging.core.tagging.models import Tag, Taxonomy
+from openedx_tagging.core.tagging.models import ObjectTag, Tag, Taxonomy
 
 from openedx_tagging.core.tagging.api import delete_tags_from_taxonomy, get_children_tags, tag_object
 from openedx_tagging.core.tagging.import_export import api as import_api
@@ -49,12 +62,19 @@ from openedx.core.djangoapps.discussions.tasks import (
 )
 
 
-# Configuring logger while running in the shell to make it less verbose
+# Configuring logger while running in the shell to make it less verbose.
+# Records are written from a separate thread through a queue, so logging
+# doesn't block the run. Set GENERATE_LOG_LEVEL=DEBUG to log every tagged block.
 logger = logging.getLogger("taxonomy-sample-data")
 logger.propagate = False
+logger.setLevel(os.environ.get("GENERATE_LOG_LEVEL", "INFO").upper())
 logger_handler = logging.StreamHandler()
-logger.addHandler(logger_handler)
 logger_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s - %(message)s'))
+logger_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(logger_queue))
+logger_listener = logging.handlers.QueueListener(logger_queue, logger_handler)
+logger_listener.start()
+atexit.register(logger_listener.stop)
 
 
 # ----------------------------------- UTILS -----------------------------------
@@ -139,11 +159,11 @@ def validate_user(user_id):
 
 
 def import_tarfile_in_course(tarfile_path, course_key, user_id):
-    """Helper method to import provided tarfile in the course."""
+    """Helper method to import provided tarfile in the course, returns whether it succeeded."""
 
     user = validate_user(user_id)
     if not user:
-        return
+        return False
 
     data_root = path(settings.GITHUB_REPO_ROOT)
     subdir = base64.urlsafe_b64encode(repr(course_key).encode('utf-8')).decode('utf-8')
@@ -161,10 +181,10 @@ def import_tarfile_in_course(tarfile_path, course_key, user_id):
 
         dirpath = verify_root_name_exists(course_dir, root_name)
         if not dirpath:
-            return
+            return False
 
         if not validate_course_olx(course_key, dirpath):
-            return
+            return False
 
         dirpath = os.path.relpath(dirpath, data_root)
 
@@ -183,6 +203,7 @@ def import_tarfile_in_course(tarfile_path, course_key, user_id):
         logger.debug('new course at %s', new_location)
 
         logger.info(f'Course import successful')
+        return True
 
     except SuspiciousOperation as exc:
         logger.error(f'Unsafe tar file')
@@ -194,6 +215,7 @@ def import_tarfile_in_course(tarfile_path, course_key, user_id):
         if course_dir.isdir():
             shutil.rmtree(course_dir)
             logger.info('Temp data cleared')
+    return False
 
 # -----------------------------------------------------------------------------
 
@@ -224,10 +246,69 @@ HIERARCHICAL_TAXONOMY_NAME = "HierarchicalTaxonomy"
 TWO_LEVEL_TAXONOMY_NAME = "TwoLevelTaxonomy"
 MULTI_ORG_TAXONOMY_NAME = "MultiOrgTaxonomy"
 NONE_ORG_TAXONOMY_NAME = "NoneOrgTaxonomy"
+SKEWED_TAXONOMY_NAME = "SkewedTaxonomy"
+OPEN_CANADA_TAXONOMY_NAME = "ESDC Skills and Competencies"
+LIGHTCAST_SKILLS_TAXONOMY_NAME = "Lightcast Open Skills Taxonomy"
+WGU_TAXONOMY_NAME = "WGU Instructional Design: K-12 Collection"
+
+# Shape of the generated taxonomies. Hierarchical taxonomies get
+# TAGS_MULTIPLIER^level tags at each level, across MAX_LEVELS levels.
+DISABLED_TAXONOMY_TAGS_COUNT = 10
+FLAT_TAXONOMY_TAGS_COUNT = 5000
+MULTI_ORG_TAXONOMY_TAGS_COUNT = 5
+HIERARCHICAL_TAXONOMY_MAX_LEVELS = 3
+HIERARCHICAL_TAXONOMY_TAGS_MULTIPLIER = 4
+TWO_LEVEL_TAXONOMY_MAX_LEVELS = 2
+TWO_LEVEL_TAXONOMY_TAGS_MULTIPLIER = 1
+NONE_ORG_TAXONOMY_MAX_LEVELS = 3
+NONE_ORG_TAXONOMY_TAGS_MULTIPLIER = 3
+
+# Deepest level supported by openedx_tagging below the root tags
+# (openedx_tagging.core.tagging.models.base.TAXONOMY_MAX_DEPTH)
+TAXONOMY_MAX_DEPTH = 3
 
 IMPORT_OPEN_CANADA_TAXONOMY = True
 IMPORT_LIGHTCAST_SKILLS_TAXONOMY = True
 IMPORT_WGU_TAXONOMY = True
+GENERATE_SKEWED_TAXONOMY = True
+
+# Arguments of `generate_shaped_tree` for the skewed taxonomy
+SKEWED_TAXONOMY_SHAPE = {
+    "root_count": 20,
+    "max_depth": TAXONOMY_MAX_DEPTH + 1,
+    "seed": 26,
+    "max_tags": 5000,
+}
+
+OPEN_CANADA_TAXONOMY_PATH = f"{TAXONOMY_SAMPLE_PATH}/sample_data/open_canada_taxonomy.json"
+LIGHTCAST_SKILLS_TAXONOMY_PATH = f"{TAXONOMY_SAMPLE_PATH}/sample_data/lightcast_taxonomy.json"
+WGU_TAXONOMY_PATH = f"{TAXONOMY_SAMPLE_PATH}/sample_data/wgu_instructional_design_2023-01-29.csv"
+
+# Phases to run even if their inputs didn't change, eg:
+# GENERATE_PHASES=wgu_taxonomy,tagging python manage.py cms shell < generate.py
+GENERATE_PHASES = [name for name in os.environ.get("GENERATE_PHASES", "").split(",") if name]
+# Run every enabled phase, resetting all the sample data, eg:
+# GENERATE_FULL_RESET=1 python manage.py cms shell < generate.py
+GENERATE_FULL_RESET = os.environ.get("GENERATE_FULL_RESET") == "1"
+# Records the inputs of the last successful run of each phase.
+# Changes made in the database are not detected, use GENERATE_FULL_RESET to undo them.
+GENERATE_STATE_PATH = f"{TAXONOMY_SAMPLE_PATH}/.generate_state.json"
+
+# Seconds between progress lines of long traversals
+PROGRESS_LOG_INTERVAL = 10
+
+# Synthetic object tags to load test object tag queries, decoupled from the
+# blocks of the sample course. Each org gets
+# LOAD_TEST_COURSES_PER_ORG * (LOAD_TEST_BLOCKS_PER_COURSE + 1) tagged objects.
+GENERATE_LOAD_TEST_OBJECT_TAGS = False
+LOAD_TEST_COURSE_NUMBER_PREFIX = "LOADTEST"
+LOAD_TEST_COURSES_PER_ORG = 100
+LOAD_TEST_BLOCKS_PER_COURSE = 1000
+LOAD_TEST_BLOCK_TYPES = ["vertical", "html", "problem", "video"]
+# Amount of tags per object and taxonomy: ("poisson", mean), ("zipf", exponent) or ("uniform", max)
+LOAD_TEST_TAGS_PER_OBJECT = ("poisson", 1.5)
+LOAD_TEST_MAX_TAGS_PER_OBJECT = 10
+LOAD_TEST_BATCH_SIZE = 10000
 
 
 def get_or_create_taxonomy(org_taxonomies, name, orgs, enabled=True, description="", old_name=None, all_orgs=True):
@@ -286,9 +367,9 @@ def get_or_create_taxonomy(org_taxonomies, name, orgs, enabled=True, description
 
 def create_tags_for_disabled_taxonomy(disabled_taxonomy):
     """
-    Create 10 Tags for the disabled_taxonomy
+    Create DISABLED_TAXONOMY_TAGS_COUNT Tags for the disabled_taxonomy
     """
-    for i in range(10):
+    for i in range(DISABLED_TAXONOMY_TAGS_COUNT):
         Tag.objects.create(
             taxonomy=disabled_taxonomy, value=f"disabled taxonomy tag {i+1}"
         )
@@ -296,9 +377,9 @@ def create_tags_for_disabled_taxonomy(disabled_taxonomy):
 
 def create_tags_for_flat_taxonomy(flat_taxonomy):
     """
-    Create 5000 Tags for the flat_taxonomy
+    Create FLAT_TAXONOMY_TAGS_COUNT Tags for the flat_taxonomy
     """
-    for i in range(5000):
+    for i in range(FLAT_TAXONOMY_TAGS_COUNT):
         Tag.objects.create(
             taxonomy=flat_taxonomy, value=f"flat taxonomy tag {i+1}"
         )
@@ -343,35 +424,29 @@ def _create_tags_recursively(
 
 def create_tags_for_hierarchical_taxonomy(hierarchical_taxonomy):
     """
-    Create 4^x Tags across 3 levels for the hierarchical_taxonomy
+    Create 4^x Tags across 3 levels (by default) for the hierarchical_taxonomy
     """
-    MAX_LEVELS = 3
-    TAGS_MULTIPLIER = 4
-
     _create_tags_recursively(
-        1, MAX_LEVELS, TAGS_MULTIPLIER,
+        1, HIERARCHICAL_TAXONOMY_MAX_LEVELS, HIERARCHICAL_TAXONOMY_TAGS_MULTIPLIER,
         hierarchical_taxonomy, "hierarchical taxonomy tag", parent=None
     )
 
 
 def create_tags_for_two_level_taxonomy(two_level_taxonomy):
     """
-    Create 2 Tags across 2 levels for the two_level_taxonomy
+    Create 2 Tags across 2 levels (by default) for the two_level_taxonomy
     """
-    MAX_LEVELS = 2
-    TAGS_MULTIPLIER = 1
-
     _create_tags_recursively(
-        1, MAX_LEVELS, TAGS_MULTIPLIER,
+        1, TWO_LEVEL_TAXONOMY_MAX_LEVELS, TWO_LEVEL_TAXONOMY_TAGS_MULTIPLIER,
         two_level_taxonomy, "two level tag", parent=None
     )
 
 
 def create_tags_for_multi_org_taxonomy(multi_org_taxonomy):
     """
-    Create 5 tags for the multi_org_taxonomy
+    Create MULTI_ORG_TAXONOMY_TAGS_COUNT tags for the multi_org_taxonomy
     """
-    for i in range(5):
+    for i in range(MULTI_ORG_TAXONOMY_TAGS_COUNT):
         Tag.objects.create(
             taxonomy=multi_org_taxonomy, value=f"multi org taxonomy tag {i}"
         )
@@ -379,16 +454,130 @@ def create_tags_for_multi_org_taxonomy(multi_org_taxonomy):
 
 def create_tags_for_none_org_taxonomy(none_org_taxonomy):
     """
-    Create 3^x Tags across 3 levels for the none_org_taxonomy
+    Create 3^x Tags across 3 levels (by default) for the none_org_taxonomy
     """
-    MAX_LEVELS = 3
-    TAGS_MULTIPLIER = 3
     _create_tags_recursively(
-        1, MAX_LEVELS, TAGS_MULTIPLIER,
+        1, NONE_ORG_TAXONOMY_MAX_LEVELS, NONE_ORG_TAXONOMY_TAGS_MULTIPLIER,
         none_org_taxonomy, "none org tag", parent=None
     )
 
 
+def generate_shaped_tree(
+    tag_value_prefix, root_count, max_depth, seed=None, zipf_exponent=2.0,
+    max_fanout=50, expand_probability=0.6, depth_decay=0.7,
+    wide_node_probability=0.002, wide_node_fanout=500, max_tags=None,
+):
+    """
+    Generate a tree with skewed fan-out and depth, one level at a time
+
+    Instead of the regular x^level trees built by `_create_tags_recursively`,
+    the shape of each level is sampled at once for all of its tags:
+    only some tags get children (less likely the deeper the level), the
+    number of children follows a Zipf distribution and a few tags are made
+    very wide.
+
+    Arguments:
+        tag_value_prefix: prefix of value for tags being created
+        root_count: amount of tags at the root level
+        max_depth: maximum amount of levels, including the root level
+        seed: seed for the random generator, so the same tree can be rebuilt
+        zipf_exponent: exponent of the Zipf distribution of children per tag,
+                       lower values give a longer tail of wide tags
+        max_fanout: maximum amount of children sampled from the distribution
+        expand_probability: probability of a root tag having children
+        depth_decay: factor applied to expand_probability on every level
+        wide_node_probability: probability of a tag being a very wide tag
+        wide_node_fanout: amount of children of a very wide tag
+        max_tags: maximum amount of tags in the tree, None = no limit
+
+    Returns:
+        (values, parent_indexes) columns: the tag values and, for each tag,
+        the index of its parent in values (-1 for root tags). Tags are
+        ordered level by level, so parents always come before their children.
+    """
+    rng = np.random.default_rng(seed)
+    paths = [str(i + 1) for i in range(root_count)]
+    parent_indexes = [np.full(root_count, -1, dtype=np.int64)]
+    level = np.arange(root_count)
+
+    for depth in range(1, max_depth):
+        probability = expand_probability * depth_decay ** (depth - 1)
+        expanding = level[rng.random(len(level)) < probability]
+        fanouts = np.minimum(rng.zipf(zipf_exponent, len(expanding)), max_fanout)
+        fanouts[rng.random(len(expanding)) < wide_node_probability] = wide_node_fanout
+
+        if max_tags is not None:
+            # Trim the level so the whole tree stays within max_tags
+            remaining = max(max_tags - len(paths), 0)
+            fanouts = np.clip(remaining - (np.cumsum(fanouts) - fanouts), 0, fanouts)
+
+        children_parents = np.repeat(expanding, fanouts)
+        if len(children_parents) == 0:
+            break
+
+        # Position of each child among its siblings, starting at 1
+        sibling_offsets = np.repeat(np.cumsum(fanouts) - fanouts, fanouts)
+        ordinals = np.arange(len(children_parents)) - sibling_offsets + 1
+
+        level = np.arange(len(paths), len(paths) + len(children_parents))
+        paths.extend(
+            f"{paths[parent]}.{ordinal}"
+            for parent, ordinal in zip(children_parents.tolist(), ordinals.tolist())
+        )
+        parent_indexes.append(children_parents)
+
+    values = [f"{tag_value_prefix} {tag_path}" for tag_path in paths]
+    return values, np.concatenate(parent_indexes)
+
+
+def bulk_create_tags(taxonomy, values, parent_indexes, batch_size=1000):
+    """
+    Bulk create Tags from flat (value, parent index) columns
+
+    Arguments:
+        taxonomy: taxonomy tags belong to
+        values: list of tag values
+        parent_indexes: index of each tag's parent in values, -1 = root tag.
+                        Parents must come before their children.
+        batch_size: amount of tags inserted per query
+    """
+    parent_indexes = np.asarray(parent_indexes)
+    tag_ids = np.zeros(len(values), dtype=np.int64)
+    start = 0
+
+    while start < len(values):
+        # Insert up to the first tag whose parent hasn't been created yet,
+        # which is a whole level for trees from `generate_shaped_tree`
+        pending_parents = np.nonzero(parent_indexes[start:] >= start)[0]
+        end = start + pending_parents[0] if len(pending_parents) else len(values)
+
+        Tag.objects.bulk_create(
+            [
+                Tag(
+                    taxonomy=taxonomy,
+                    value=values[i],
+                    parent_id=int(tag_ids[parent_indexes[i]]) if parent_indexes[i] >= 0 else None,
+                )
+                for i in range(start, end)
+            ],
+            batch_size=batch_size,
+        )
+
+        # bulk_create doesn't return primary keys on every database backend
+        created_ids = dict(Tag.objects.filter(taxonomy=taxonomy).values_list("value", "id"))
+        tag_ids[start:end] = [created_ids[value] for value in values[start:end]]
+        start = end
+
+
+def create_tags_for_skewed_taxonomy(skewed_taxonomy):
+    """
+    Create Tags with uneven fan-out and depth, shaped by SKEWED_TAXONOMY_SHAPE,
+    for the skewed_taxonomy
+    """
+    values, parent_indexes = generate_shaped_tree("skewed taxonomy tag", **SKEWED_TAXONOMY_SHAPE)
+    bulk_create_tags(skewed_taxonomy, values, parent_indexes)
+
+
 def create_tags_from_json(open_canada_taxonomy, import_json_path):
     """
     Create tags based what is defined in JSON import spec
@@ -413,6 +602,125 @@ def create_tags_from_json(open_canada_taxonomy, import_json_path):
     _create_tags(taxonomy_data, None)
 
 
+def find_tag_conflicts(rows):
+    """
+    Find conflicts in taxonomy source rows in one pass, without touching the database
+
+    Arguments:
+        rows: list of (location, value, external_id, parent_external_id) tuples,
+              where location describes the row in its source for error
+              messages and parent_external_id is None for root tags
+
+    Returns:
+        List of conflict messages, empty if the rows can be imported
+    """
+    conflicts = []
+    values_index = {}
+    external_ids_index = {}
+    parents_index = {}
+
+    for location, value, external_id, parent_external_id in rows:
+        if not value:
+            conflicts.append(f"{location}: missing value")
+        else:
+            # The default MySQL collation compares values case-insensitively
+            value_key = value.casefold()
+            if value_key in values_index:
+                conflicts.append(
+                    f"{location}: duplicate value {value!r}, already used at {values_index[value_key]}"
+                )
+            else:
+                values_index[value_key] = location
+
+        if not external_id:
+            continue
+        if external_id in external_ids_index:
+            conflicts.append(
+                f"{location}: duplicate external_id {external_id!r}, "
+                f"already used at {external_ids_index[external_id]}"
+            )
+            continue
+        external_ids_index[external_id] = location
+        if parent_external_id:
+            parents_index[external_id] = parent_external_id
+
+    for external_id, parent_external_id in parents_index.items():
+        if parent_external_id not in external_ids_index:
+            conflicts.append(
+                f"{external_ids_index[external_id]}: parent {parent_external_id!r} does not exist"
+            )
+
+    # Follow each chain of parents only until it reaches an already checked tag
+    checked = set()
+    for external_id in parents_index:
+        chain = set()
+        current = external_id
+        while current in parents_index and current not in checked:
+            if current in chain:
+                conflicts.append(f"{external_ids_index[current]}: {current!r} is its own ancestor")
+                break
+            chain.add(current)
+            current = parents_index[current]
+        checked.update(chain)
+
+    return conflicts
+
+
+def find_json_taxonomy_conflicts(import_json_path):
+    """
+    Find conflicts in a JSON taxonomy source, as used by `create_tags_from_json`
+    """
+    with open(import_json_path, 'r') as json_file:
+        taxonomy_data = json.load(json_file)
+
+    rows = []
+    pending = [(data, None, f"[{i}]") for i, data in enumerate(taxonomy_data)]
+    while pending:
+        data, parent_external_id, location = pending.pop()
+        external_id = data.get("external_id")
+        rows.append((location, data.get("name"), external_id, parent_external_id))
+        pending.extend(
+            (child, external_id, f"{location}.children[{i}]")
+            for i, child in enumerate(data.get("children") or [])
+        )
+
+    return find_tag_conflicts(rows)
+
+
+def find_csv_taxonomy_conflicts(import_csv_path):
+    """
+    Find conflicts in a CSV taxonomy source, as used by `import_api.import_tags`
+    """
+    with open(import_csv_path, 'r', newline='') as csv_file:
+        rows = [
+            (f"line {line}", row.get("value"), row.get("id"), row.get("parent_id") or None)
+            for line, row in enumerate(csv.DictReader(csv_file), start=2)
+        ]
+
+    conflicts = find_tag_conflicts(rows)
+    conflicts += [f"{location}: missing id" for location, _value, external_id, _parent in rows if not external_id]
+    return conflicts
+
+
+def validate_taxonomy_sources(sources):
+    """
+    Check all taxonomy sources before anything is written to the database
+
+    Arguments:
+        sources: list of (name, path, find_conflicts) tuples
+
+    Raises an Exception listing every conflict found in the sources.
+    """
+    errors = []
+    for name, source_path, find_conflicts in sources:
+        conflicts = find_conflicts(source_path)
+        logger.info(f"Validated {name} source: {len(conflicts)} conflicts")
+        errors += [f"{name}: {conflict}" for conflict in conflicts]
+
+    if errors:
+        raise Exception("Invalid taxonomy sources:\n" + "\n".join(errors))
+
+
 def tagify_object(object_id, taxonomies):
     """
     Tag object with tags from the provided taxonomies
@@ -420,7 +728,10 @@ def tagify_object(object_id, taxonomies):
     Arguments:
         object_id: ID of object to be tagged
         taxonomies: list of taxonomies of tags to tag object with
+
+    Returns the amount of object tags written or re-synced
     """
+    tags_written = 0
     for taxonomy in taxonomies:
         tags = get_tags(taxonomy)
         total_tags = len(tags)
@@ -441,81 +752,351 @@ def tagify_object(object_id, taxonomies):
             tag_values.append(random_tag["value"])
             if second_tag:
                 tag_values.append(second_tag["value"])
+        # The same leaf tag can be picked more than once
+        tag_values = list(dict.fromkeys(tag_values))
         try:
             tag_object(
                 object_id=str(object_id),
                 taxonomy=taxonomy,
                 tags=tag_values
             )
+            tags_written += len(tag_values)
         except IntegrityError:
-            # content tag value already exists, we need to resync with
-            # new tag instance
+            # content tag value already exists from a previous run,
+            # we need to resync with new tag instance
             content_tags = get_object_tags(object_id, taxonomy.id)
             resync_object_tags(content_tags)
+            tags_written += len(content_tags)
+    return tags_written
 
 
-# Generate sample organizations or retrieve them if they already exist
-logger.info("Generating or retrieving sample Organizations...")
-sample_orgs = []
-for i in range(1, SAMPLE_ORGS_COUNT+1):
-    org, created = Organization.objects.get_or_create(
-        name=f"{SAMPLE_ORG_NAME}{i}",
-        short_name=f"{SAMPLE_ORG_NAME}{i}"
-    )
-    logger.info(f"{'Created' if created else 'Retrieved'} {org}")
-    sample_orgs.append(org)
+class ProgressReporter:
+    """
+    Log the aggregate progress of a long loop, at most once every PROGRESS_LOG_INTERVAL seconds
 
-store = modulestore()
+    Arguments:
+        label: what is being done, used as prefix of the progress lines
+        total: amount of items to process (or an estimate), used for the remaining time
+        unit: name of the items processed
+        written_unit: name of the rows written while processing the items,
+                      None if the items are the rows written
+    """
 
-# Retrieve/Create multi org Taxonomy with 5 tags for the sample orgs
-logger.info(f"Creating or retrieving {MULTI_ORG_TAXONOMY_NAME}")
-multi_org_taxonomy = get_or_create_taxonomy(
-    None, MULTI_ORG_TAXONOMY_NAME, sample_orgs, enabled=True,
-    description="A taxonomy shared by multiple orgs.",
-)
+    def __init__(self, label, total, unit="blocks", written_unit="tags"):
+        self.label = label
+        self.total = total
+        self.unit = unit
+        self.written_unit = written_unit
+        self.done = 0
+        self.written = 0
+        self.started = self.last_report = time.monotonic()
 
-# Clear any existing Tags for hierarchical_taxonomy and create fresh ones
-multi_org_taxonomy_tags = get_tags(multi_org_taxonomy)
-logger.info(f"Clearing existing {len(multi_org_taxonomy_tags)} Tags for {multi_org_taxonomy}")
-delete_tags_from_taxonomy(
-    multi_org_taxonomy,
-    list(map(lambda t: t["value"], multi_org_taxonomy_tags)),
-    with_subtags=True
-)
+    def update(self, done=1, written=0):
+        """
+        Count processed items and written rows, logging the progress if the interval elapsed
+        """
+        self.done += done
+        self.written += written
+        now = time.monotonic()
+        if now - self.last_report >= PROGRESS_LOG_INTERVAL:
+            self.last_report = now
+            self.report(now)
+
+    def report(self, now=None):
+        """
+        Log the items processed, rows written, throughput and estimated remaining time
+        """
+        elapsed = (now or time.monotonic()) - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0
+        remaining = max(self.total - self.done, 0)
+        eta = datetime.timedelta(seconds=round(remaining / rate)) if rate else "unknown"
+        progress = f"{self.done}/{self.total} {self.unit}"
+        if self.written_unit:
+            progress += f", {self.written} {self.written_unit} written"
+        logger.info(f"{self.label}: {progress}, {rate:.1f} {self.unit}/sec, ETA {eta}")
 
-logger.info(f"Creating fresh Tags for {multi_org_taxonomy}")
-multi_org_taxonomy_tags = create_tags_for_multi_org_taxonomy(multi_org_taxonomy)
 
+def sample_tags_per_object(rng, size):
+    """
+    Sample the amount of tags of `size` objects from LOAD_TEST_TAGS_PER_OBJECT
+    """
+    distribution, parameter = LOAD_TEST_TAGS_PER_OBJECT
+    if distribution == "poisson":
+        counts = rng.poisson(parameter, size)
+    elif distribution == "zipf":
+        # Zipf samples start at 1, shift them so some objects get no tags
+        counts = rng.zipf(parameter, size) - 1
+    elif distribution == "uniform":
+        counts = rng.integers(0, parameter, size, endpoint=True)
+    else:
+        raise Exception(f"Unknown tags per object distribution: {distribution}")
+    return np.minimum(counts, LOAD_TEST_MAX_TAGS_PER_OBJECT)
+
+
+def get_taxonomies_leaf_tags(taxonomies):
+    """
+    Return a list of (taxonomy, leaf tags) for the taxonomies that have tags
+    """
+    taxonomies_leaf_tags = []
+    for taxonomy in taxonomies:
+        leaf_tags = list(Tag.objects.filter(taxonomy=taxonomy, children__isnull=True))
+        if leaf_tags:
+            taxonomies_leaf_tags.append((taxonomy, leaf_tags))
+    return taxonomies_leaf_tags
 
-# Retrieve/Create none org Taxonomy
-logger.info(f"Creating or retrieving {NONE_ORG_TAXONOMY_NAME}")
-none_org_taxonomy = get_or_create_taxonomy(
-    None, NONE_ORG_TAXONOMY_NAME, [], enabled=True,
-    description="A taxonomy with none associated orgs.",
-    all_orgs=False,
-)
 
-# Clear any existing Tags for none_org_taxonomy and create fresh ones
-none_org_taxonomy_tags = get_tags(none_org_taxonomy)
-logger.info(f"Clearing existing {len(none_org_taxonomy_tags)} Tags for {none_org_taxonomy}")
-delete_tags_from_taxonomy(
-    none_org_taxonomy,
-    list(map(lambda t: t["value"], none_org_taxonomy_tags)),
-    with_subtags=True
-)
+def generate_load_test_object_tags(org, taxonomies_leaf_tags, seed=None):
+    """
+    Generate ObjectTags for synthetic courses and blocks of an org
+
+    The objects don't exist in the modulestore, only their ids are generated.
+    Objects are tagged with leaf tags only, like `tagify_object` does.
+
+    Arguments:
+        org: org of the synthetic courses
+        taxonomies_leaf_tags: list of (taxonomy, leaf tags) to tag objects with
+        seed: seed for the random generator
+    """
+    rng = np.random.default_rng(seed)
+
+    for course_index in range(LOAD_TEST_COURSES_PER_ORG):
+        course_key = CourseLocator(
+            org.short_name, f"{LOAD_TEST_COURSE_NUMBER_PREFIX}{course_index + 1}", COURSE_RUN
+        )
+        object_ids = [str(course_key)] + [
+            str(course_key.make_usage_key(
+                LOAD_TEST_BLOCK_TYPES[i % len(LOAD_TEST_BLOCK_TYPES)], f"{i + 1:032x}"
+            ))
+            for i in range(LOAD_TEST_BLOCKS_PER_COURSE)
+        ]
+
+        for taxonomy, leaf_tags in taxonomies_leaf_tags:
+            counts = sample_tags_per_object(rng, len(object_ids))
+            object_indexes = np.repeat(np.arange(len(object_ids)), counts)
+            tag_indexes = rng.integers(0, len(leaf_tags), len(object_indexes))
+            # Drop the same leaf tag picked more than once for an object
+            pairs = np.unique(object_indexes * len(leaf_tags) + tag_indexes)
+            for object_index, tag_index in zip(
+                (pairs // len(leaf_tags)).tolist(), (pairs % len(leaf_tags)).tolist()
+            ):
+                yield ObjectTag(
+                    object_id=object_ids[object_index],
+                    taxonomy=taxonomy,
+                    tag=leaf_tags[tag_index],
+                )
+
+
+def estimate_load_test_object_tags(taxonomies_leaf_tags):
+    """
+    Estimate the amount of ObjectTags generated for an org, to report the load test progress
+
+    Arguments:
+        taxonomies_leaf_tags: list of (taxonomy, leaf tags) objects are tagged with
+    """
+    counts = sample_tags_per_object(np.random.default_rng(0), 10000)
+    mean_tags_per_object = 0
+    for _taxonomy, leaf_tags in taxonomies_leaf_tags:
+        # Expected distinct tags out of `counts` picks among the leaf tags,
+        # as the same leaf tag picked more than once is written once
+        leaves = len(leaf_tags)
+        mean_tags_per_object += (leaves * (1 - (1 - 1 / leaves) ** counts)).mean()
+    objects_count = LOAD_TEST_COURSES_PER_ORG * (LOAD_TEST_BLOCKS_PER_COURSE + 1)
+    return round(objects_count * mean_tags_per_object)
+
+
+def bulk_create_object_tags(object_tags, batch_size, progress=None):
+    """
+    Write ObjectTags from an iterable in batches of batch_size, returns the amount written
+
+    Arguments:
+        object_tags: iterable of ObjectTags to write
+        batch_size: amount of ObjectTags inserted per query
+        progress: ProgressReporter updated after every batch
+    """
+    object_tags = iter(object_tags)
+    written = 0
+    while True:
+        batch = list(itertools.islice(object_tags, batch_size))
+        if not batch:
+            return written
+        ObjectTag.objects.bulk_create(batch)
+        written += len(batch)
+        if progress:
+            progress.update(done=len(batch))
+
+
+# ---------------------------------- PHASES -----------------------------------
+# The run is a graph of named phases. A phase runs when it is selected in
+# GENERATE_PHASES or when its inputs (source files, config values and the
+# runs of its upstream phases) changed since its last successful run, which
+# is recorded in GENERATE_STATE_PATH.
+
+PHASES = {}
+
+
+def phase(name, enabled=True, sources=(), config=None, upstream=()):
+    """
+    Register the decorated function as a phase of the run
+
+    Phases run in the order they are registered, so upstream phases must be
+    registered first. The function is called with the list of sample orgs.
+
+    Arguments:
+        name: name used to select the phase in GENERATE_PHASES
+        enabled: False to leave the phase out of the run
+        sources: paths of files read by the phase
+        config: dict of the config values used by the phase
+        upstream: names of phases whose output is used by the phase
+    """
+    def decorator(func):
+        PHASES[name] = {
+            "func": func,
+            "enabled": enabled,
+            "sources": list(sources),
+            "config": config or {},
+            "upstream": list(upstream),
+        }
+        return func
+    return decorator
+
+
+def _file_digest(file_path):
+    """Return the sha256 digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file_handle:
+        for chunk in iter(lambda: file_handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def phase_fingerprint(name, run_ids):
+    """
+    Fingerprint the inputs of a phase
+
+    Arguments:
+        name: name of the phase
+        run_ids: id of the last run of each phase, which stands in for
+                 the output of upstream phases
+    """
+    spec = PHASES[name]
+    inputs = {
+        "sources": {source: _file_digest(source) for source in spec["sources"]},
+        "config": {key: repr(value) for key, value in spec["config"].items()},
+        "upstream": {upstream: run_ids.get(upstream) for upstream in spec["upstream"]},
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+
+def load_phases_state():
+    """Load the fingerprint and run id of the last successful run of each phase"""
+    try:
+        with open(GENERATE_STATE_PATH, "r") as state_file:
+            return json.load(state_file)
+    except FileNotFoundError:
+        return {}
+
+
+def save_phases_state(state):
+    """Save the fingerprint and run id of the last successful run of each phase"""
+    with open(GENERATE_STATE_PATH, "w") as state_file:
+        json.dump(state, state_file, indent=2, sort_keys=True)
+
+
+def plan_phases(selected, state, full_reset=False):
+    """
+    Return the names of the phases to run, in order
+
+    Arguments:
+        selected: names of the phases selected in GENERATE_PHASES
+        state: state of the last successful runs
+        full_reset: True to run every enabled phase
+    """
+    unknown = set(selected) - set(PHASES)
+    if unknown:
+        raise Exception(f"Unknown phases {sorted(unknown)}, available phases: {list(PHASES)}")
+
+    disabled = [name for name in selected if not PHASES[name]["enabled"]]
+    if disabled:
+        raise Exception(f"Selected phases {disabled} are disabled, enable them in generate.py")
+
+    run_ids = {name: phase_state.get("run_id") for name, phase_state in state.items()}
+    planned = []
+    for name, spec in PHASES.items():
+        if not spec["enabled"]:
+            continue
+        if (
+            full_reset or name in selected
+            or phase_fingerprint(name, run_ids) != state.get(name, {}).get("fingerprint")
+        ):
+            planned.append(name)
+            # It will get a new run id, so its downstream phases will run too
+            run_ids[name] = None
+    return planned
+
+
+def run_phases(planned, state, sample_orgs):
+    """
+    Run the planned phases, recording each successful run in the state
+    """
+    run_ids = {name: phase_state.get("run_id") for name, phase_state in state.items()}
+    for name in planned:
+        fingerprint = phase_fingerprint(name, run_ids)
+        logger.info(f"Running phase {name}")
+        PHASES[name]["func"](sample_orgs)
+        run_ids[name] = uuid.uuid4().hex
+        state[name] = {"fingerprint": fingerprint, "run_id": run_ids[name]}
+        save_phases_state(state)
+
+# -----------------------------------------------------------------------------
+
+
+def recreate_tags(taxonomy, create_tags):
+    """
+    Clear any existing Tags for taxonomy and create fresh ones with create_tags
+    """
+    taxonomy_tags = get_tags(taxonomy)
+    logger.info(f"Clearing existing {len(taxonomy_tags)} Tags for {taxonomy}")
+    delete_tags_from_taxonomy(
+        taxonomy,
+        list(map(lambda t: t["value"], taxonomy_tags)),
+        with_subtags=True
+    )
+
+    logger.info(f"Creating fresh Tags for {taxonomy}")
+    create_tags(taxonomy)
+
+
+def get_multi_org_taxonomy(sample_orgs):
+    """
+    Retrieve/Create multi org Taxonomy for the sample orgs
+    """
+    logger.info(f"Creating or retrieving {MULTI_ORG_TAXONOMY_NAME}")
+    return get_or_create_taxonomy(
+        None, MULTI_ORG_TAXONOMY_NAME, sample_orgs, enabled=True,
+        description="A taxonomy shared by multiple orgs.",
+    )
 
-logger.info(f"Creating fresh Tags for {none_org_taxonomy}")
-none_org_taxonomy_tags = create_tags_for_none_org_taxonomy(none_org_taxonomy)
 
-if IMPORT_OPEN_CANADA_TAXONOMY:
-    OPEN_CANADA_TAXONOMY_NAME = "ESDC Skills and Competencies"
-    OPEN_CANADA_TAXONOMY_PATH = f"{TAXONOMY_SAMPLE_PATH}/sample_data/open_canada_taxonomy.json"
+def get_none_org_taxonomy():
+    """
+    Retrieve/Create none org Taxonomy
+    """
+    logger.info(f"Creating or retrieving {NONE_ORG_TAXONOMY_NAME}")
+    return get_or_create_taxonomy(
+        None, NONE_ORG_TAXONOMY_NAME, [], enabled=True,
+        description="A taxonomy with none associated orgs.",
+        all_orgs=False,
+    )
+
 
-    # Retrieve/Create Open Canada Taxonomy:
-    # https://open.canada.ca/data/en/dataset/6093c709-2a0d-4c23-867e-27987a79212c/resource/0a120b15-9708-4d8a-8af2-2431c4540c0b
-    # It has four levels (Category > Sub-Category > Similarity Group > Descriptor
+def get_open_canada_taxonomy(sample_orgs):
+    """
+    Retrieve/Create Open Canada Taxonomy:
+    https://open.canada.ca/data/en/dataset/6093c709-2a0d-4c23-867e-27987a79212c/resource/0a120b15-9708-4d8a-8af2-2431c4540c0b
+    It has four levels (Category > Sub-Category > Similarity Group > Descriptor
+    """
     logger.info(f"Creating or retrieving {OPEN_CANADA_TAXONOMY_NAME}")
-    open_canada_taxonomy = get_or_create_taxonomy(
+    return get_or_create_taxonomy(
         None, OPEN_CANADA_TAXONOMY_NAME, sample_orgs, enabled=True,
         description=(
             "Employment and Social Development Canada - Skills and Competencies Taxonomy (EN) 2023 Version 1.0. "
@@ -524,31 +1105,15 @@ if IMPORT_OPEN_CANADA_TAXONOMY:
         old_name="OpenCanadaTaxonomy",
     )
 
-    # Clear any existing Tags for open_canada_taxonomy and create fresh ones
-    open_canada_taxonomy_tags = get_tags(open_canada_taxonomy)
-    logger.info(
-        f"Clearing existing {len(open_canada_taxonomy_tags)} Tags for {open_canada_taxonomy}"
-    )
-    delete_tags_from_taxonomy(
-        open_canada_taxonomy,
-        list(map(lambda t: t["value"], open_canada_taxonomy_tags)),
-        with_subtags=True
-    )
-
-    logger.info(f"Creating fresh Tags for {open_canada_taxonomy}")
-
-    create_tags_from_json(open_canada_taxonomy, OPEN_CANADA_TAXONOMY_PATH)
 
-
-if IMPORT_LIGHTCAST_SKILLS_TAXONOMY:
-    LIGHTCAST_SKILLS_TAXONOMY_NAME = "Lightcast Open Skills Taxonomy"
-    LIGHTCAST_SKILLS_TAXONOMY_PATH = f"{TAXONOMY_SAMPLE_PATH}/sample_data/lightcast_taxonomy.json"
-
-    # Retrieve/Create Lightcast Open Skills Taxonomy:
-    # https://docs.google.com/spreadsheets/d/1DA3JfpBE5Krc0daImuu5Y0nsH93PEfdrWRrEa-sR-6k/edit#gid=1319222368
-    # It has three levels (Category > Sub-Category > Skill
+def get_lightcast_skills_taxonomy():
+    """
+    Retrieve/Create Lightcast Open Skills Taxonomy:
+    https://docs.google.com/spreadsheets/d/1DA3JfpBE5Krc0daImuu5Y0nsH93PEfdrWRrEa-sR-6k/edit#gid=1319222368
+    It has three levels (Category > Sub-Category > Skill
+    """
     logger.info(f"Creating or retrieving {LIGHTCAST_SKILLS_TAXONOMY_NAME}")
-    lightcast_skills_taxonomy = get_or_create_taxonomy(
+    return get_or_create_taxonomy(
         None, LIGHTCAST_SKILLS_TAXONOMY_NAME, orgs=None, enabled=True,
         description=(
             "4,268 skill tags from the LightCast Open Skills Taxonomy. "
@@ -557,25 +1122,26 @@ if IMPORT_LIGHTCAST_SKILLS_TAXONOMY:
         old_name="LightCastSkillsTaxonomy",
     )
 
-    # Clear any existing Tags for lightcast_skills_taxonomy and create fresh ones
-    lightcast_skills_taxonomy_tags = get_tags(lightcast_skills_taxonomy)
-    logger.info(
-        f"Clearing existing {len(lightcast_skills_taxonomy_tags)} Tags for {lightcast_skills_taxonomy}"
-    )
-    delete_tags_from_taxonomy(
-        lightcast_skills_taxonomy,
-        list(map(lambda t: t["value"], lightcast_skills_taxonomy_tags)),
-        with_subtags=True,
-    )
 
-    logger.info(f"Creating fresh Tags for {lightcast_skills_taxonomy}")
+def get_skewed_taxonomy():
+    """
+    Retrieve/Create skewed Taxonomy shared by all orgs, with uneven
+    fan-out and depth like real world taxonomies
+    """
+    logger.info(f"Creating or retrieving {SKEWED_TAXONOMY_NAME}")
+    return get_or_create_taxonomy(
+        None, SKEWED_TAXONOMY_NAME, orgs=None, enabled=True,
+        description="A sample taxonomy with uneven fan-out and depth.",
+    )
 
-    create_tags_from_json(lightcast_skills_taxonomy, LIGHTCAST_SKILLS_TAXONOMY_PATH)
 
-if IMPORT_WGU_TAXONOMY:
-    logger.info(f"Creating/updating WGU Instructional Design Taxonomy")
-    wgu_taxonomy = get_or_create_taxonomy(
-        name="WGU Instructional Design: K-12 Collection", orgs=None, org_taxonomies=None,
+def get_wgu_taxonomy():
+    """
+    Retrieve/Create WGU Instructional Design Taxonomy
+    """
+    logger.info(f"Creating or retrieving {WGU_TAXONOMY_NAME}")
+    return get_or_create_taxonomy(
+        name=WGU_TAXONOMY_NAME, orgs=None, org_taxonomies=None,
         description=(
             "Represents the necessary skills for instructional coordinators. "
             "This collection of skills was developed in partnership with a panel of subject matter experts, "
@@ -583,168 +1149,351 @@ if IMPORT_WGU_TAXONOMY:
             "and curriculum coordinators. Author: Western Governors University"
         ),
     )
-    # Source: https://osmt.wgu.edu/api/collections/85c93bc0-e0c1-4b7d-8511-ce559e70f4cd
-    with open(f"{TAXONOMY_SAMPLE_PATH}/sample_data/wgu_instructional_design_2023-01-29.csv", "rb") as file_handle:
-        result = import_api.import_tags(wgu_taxonomy, file_handle, parser_format=import_api.ParserFormat.CSV, replace=True)
-    if not result:
-        print(import_api.get_last_import_log(wgu_taxonomy))
-        raise Exception("Failed to import WGU taxonomy")
 
 
-for org in sample_orgs:
-    generated_taxonomies = [multi_org_taxonomy]
-
-    if IMPORT_OPEN_CANADA_TAXONOMY:
-        generated_taxonomies.append(open_canada_taxonomy)
-
-    if IMPORT_LIGHTCAST_SKILLS_TAXONOMY:
-        generated_taxonomies.append(lightcast_skills_taxonomy)
-
-    # Retrieve/create Sample Taxonomy Course in org
-    logger.info(
-        f"Generating or retrieving Sample Taxonomy Courses for {org.short_name}..."
-    )
-    with store.default_store(ModuleStoreEnum.Type.split):
-        course_key = store.make_course_key(
-            org.short_name, COURSE_NUMBER, COURSE_RUN
-        )
-        sample_taxonomy_course = store.get_course(course_key)
-        if sample_taxonomy_course:
-            logger.info(f"Found Sample Taxonomy Course in {org}")
-        else:
-            fields = {
-                "display_name": COURSE_NAME
-            }
-            sample_taxonomy_course = create_new_course_in_store(
-                ModuleStoreEnum.Type.split,
-                user,
-                org.short_name,
-                COURSE_NUMBER,
-                COURSE_RUN,
-                fields
-            )
-            logger.info(f"Created Sample Taxonomy Course in {org}")
-
-    # Populate Sample Taxonomy Course with imported course data
-    logger.info(f"Importing OLX data to Sample Taxonomy Course in {org}")
-    import_tarfile_in_course(TARFILE_PATH, course_key, user.id)
-
+def get_org_taxonomies(org):
+    """
+    Retrieve/Create the disabled, flat, hierarchical and two level Taxonomies of org
+    """
     # Fetch all Taxonomies (enabled and disabled) for organization
     logger.info(f"Fetching all Taxonomies for {org}")
     org_taxonomies = get_taxonomies_for_org(enabled=None, org_short_name=org.short_name)
 
-    # Retrieve/Create disabled Taxonomy with 10 tags for org
     logger.info(f"Creating or retrieving {DISABLED_TAXONOMY_NAME}")
     disabled_taxonomy = get_or_create_taxonomy(
         org_taxonomies, DISABLED_TAXONOMY_NAME, [org], enabled=False
     )
 
-    # Clear any existing Tags for disabled_taxonomy and create fresh ones
-    disabled_taxonomy_tags = get_tags(disabled_taxonomy)
-    logger.info(
-        f"Clearing existing {len(disabled_taxonomy_tags)} Tags for {disabled_taxonomy}"
-    )
-    delete_tags_from_taxonomy(
-        disabled_taxonomy,
-        list(map(lambda t: t["value"], disabled_taxonomy_tags)),
-        with_subtags=True
-    )
-
-    logger.info(f"Creating fresh Tags for {disabled_taxonomy}")
-    create_tags_for_disabled_taxonomy(disabled_taxonomy)
-
-    # Retrieve/Create flat Taxonomy with 5000 tags for org
     logger.info(f"Creating or retrieving {FLAT_TAXONOMY_NAME}")
     flat_taxonomy = get_or_create_taxonomy(
         org_taxonomies, FLAT_TAXONOMY_NAME, [org], enabled=True,
         description=f"A simple, flat taxonomy used by {org.name}",
     )
 
-    # Clear any existing Tags for flat_taxonomy and create fresh ones
-    flat_taxonomy_tags = get_tags(flat_taxonomy)
-    logger.info(f"Clearing existing {len(flat_taxonomy_tags)} Tags for {flat_taxonomy}")
-    delete_tags_from_taxonomy(
-        flat_taxonomy,
-        list(map(lambda t: t["value"], flat_taxonomy_tags)),
-        with_subtags=True
-    )
-
-    logger.info(f"Creating fresh Tags for {flat_taxonomy}")
-    create_tags_for_flat_taxonomy(flat_taxonomy)
-
-    # Retrieve/Create hierarchical Taxonomy with three levels
-    # and 4^x tags per level (4 root tags, each with 16 child tags,
-    # each with 64 grandchild tags) for org
     logger.info(f"Creating or retrieving {HIERARCHICAL_TAXONOMY_NAME}")
     hierarchical_taxonomy = get_or_create_taxonomy(
         org_taxonomies, HIERARCHICAL_TAXONOMY_NAME, [org], enabled=True,
         description=f"A sample three-level taxonomy used by {org.name}.",
     )
 
-    # Clear any existing Tags for hierarchical_taxonomy and create fresh ones
-    hierarchical_taxonomy_tags = get_tags(hierarchical_taxonomy)
-    logger.info(
-        f"Clearing existing {len(hierarchical_taxonomy_tags)} Tags for {hierarchical_taxonomy}"
-    )
-    delete_tags_from_taxonomy(
-        hierarchical_taxonomy,
-        list(map(lambda t: t["value"], hierarchical_taxonomy_tags)),
-        with_subtags=True
-    )
-
-    logger.info(f"Creating fresh Tags for {hierarchical_taxonomy}")
-    create_tags_for_hierarchical_taxonomy(hierarchical_taxonomy)
-
-    # Retrieve/Create two level Taxonomy with 2 tag each level for org
     logger.info(f"Creating or retrieving {TWO_LEVEL_TAXONOMY_NAME}")
     two_level_taxonomy = get_or_create_taxonomy(
         org_taxonomies, TWO_LEVEL_TAXONOMY_NAME, [org], enabled=True,
         description=f"A sample two-level taxonomy used by {org.name}.",
     )
 
-    # Clear any existing tags for two_level_taxonomy and create fresh ones
-    two_level_taxonomy_tags = get_tags(two_level_taxonomy)
-    logger.info(
-        f"Clearing existing {len(two_level_taxonomy_tags)} Tags for {two_level_taxonomy}"
-    )
-    delete_tags_from_taxonomy(
-        two_level_taxonomy,
-        list(map(lambda t: t["value"], two_level_taxonomy_tags)),
-        with_subtags=True,
-    )
+    return disabled_taxonomy, flat_taxonomy, hierarchical_taxonomy, two_level_taxonomy
+
 
-    logger.info(f"Creating fresh Tags for {two_level_taxonomy}")
-    create_tags_for_two_level_taxonomy(two_level_taxonomy)
+def get_generated_taxonomies(org, sample_orgs):
+    """
+    Retrieve the Taxonomies used to tag the objects of org
+    """
+    generated_taxonomies = [get_multi_org_taxonomy(sample_orgs)]
+
+    if IMPORT_OPEN_CANADA_TAXONOMY:
+        generated_taxonomies.append(get_open_canada_taxonomy(sample_orgs))
+
+    if IMPORT_LIGHTCAST_SKILLS_TAXONOMY:
+        generated_taxonomies.append(get_lightcast_skills_taxonomy())
+
+    if GENERATE_SKEWED_TAXONOMY:
+        generated_taxonomies.append(get_skewed_taxonomy())
 
     generated_taxonomies += [
-        disabled_taxonomy, flat_taxonomy,
-        hierarchical_taxonomy, two_level_taxonomy,
-        none_org_taxonomy,
+        *get_org_taxonomies(org),
+        get_none_org_taxonomy(),
     ]
+    return generated_taxonomies
+
+
+SAMPLE_ORGS_CONFIG = {
+    "SAMPLE_ORGS_COUNT": SAMPLE_ORGS_COUNT,
+    "SAMPLE_ORG_NAME": SAMPLE_ORG_NAME,
+}
+GENERATED_TAXONOMIES_CONFIG = {
+    **SAMPLE_ORGS_CONFIG,
+    "IMPORT_OPEN_CANADA_TAXONOMY": IMPORT_OPEN_CANADA_TAXONOMY,
+    "IMPORT_LIGHTCAST_SKILLS_TAXONOMY": IMPORT_LIGHTCAST_SKILLS_TAXONOMY,
+    "GENERATE_SKEWED_TAXONOMY": GENERATE_SKEWED_TAXONOMY,
+}
+GENERATED_TAXONOMIES_PHASES = [
+    "multi_org_taxonomy", "none_org_taxonomy", "open_canada_taxonomy",
+    "lightcast_skills_taxonomy", "skewed_taxonomy", "org_taxonomies",
+]
+
+
+@phase(
+    "multi_org_taxonomy",
+    config={
+        **SAMPLE_ORGS_CONFIG,
+        "name": MULTI_ORG_TAXONOMY_NAME,
+        "tags_count": MULTI_ORG_TAXONOMY_TAGS_COUNT,
+    },
+)
+def create_multi_org_taxonomy(sample_orgs):
+    """
+    Retrieve/Create multi org Taxonomy with fresh 5 tags for the sample orgs
+    """
+    recreate_tags(get_multi_org_taxonomy(sample_orgs), create_tags_for_multi_org_taxonomy)
+
+
+@phase(
+    "none_org_taxonomy",
+    config={
+        "name": NONE_ORG_TAXONOMY_NAME,
+        "shape": (NONE_ORG_TAXONOMY_MAX_LEVELS, NONE_ORG_TAXONOMY_TAGS_MULTIPLIER),
+    },
+)
+def create_none_org_taxonomy(sample_orgs):
+    """
+    Retrieve/Create none org Taxonomy with fresh tags
+    """
+    recreate_tags(get_none_org_taxonomy(), create_tags_for_none_org_taxonomy)
 
-    # Tagging Courses and Components
 
-    # Tag course with one of each tag in taxonomies created above
-    logger.info(f"Tagging {sample_taxonomy_course.id}")
-    tagify_object(
-        sample_taxonomy_course.id,
-        generated_taxonomies
+@phase(
+    "open_canada_taxonomy", enabled=IMPORT_OPEN_CANADA_TAXONOMY,
+    sources=[OPEN_CANADA_TAXONOMY_PATH],
+    config={**SAMPLE_ORGS_CONFIG, "name": OPEN_CANADA_TAXONOMY_NAME},
+)
+def import_open_canada_taxonomy(sample_orgs):
+    """
+    Retrieve/Create Open Canada Taxonomy with fresh tags from its JSON source
+    """
+    recreate_tags(
+        get_open_canada_taxonomy(sample_orgs),
+        lambda taxonomy: create_tags_from_json(taxonomy, OPEN_CANADA_TAXONOMY_PATH),
     )
 
-    # Tag components inside units (vertical xblocks) with
-    # one of each tag created above
-    for section in get_sections(sample_taxonomy_course):
-        for subsection in get_subsections(section):
-            for unit in get_units(subsection):
-                # Tag units
-                logger.info(f"Tagging {unit.location}")
-                tagify_object(
-                    unit.location,
-                    generated_taxonomies
+
+@phase(
+    "lightcast_skills_taxonomy", enabled=IMPORT_LIGHTCAST_SKILLS_TAXONOMY,
+    sources=[LIGHTCAST_SKILLS_TAXONOMY_PATH],
+    config={"name": LIGHTCAST_SKILLS_TAXONOMY_NAME},
+)
+def import_lightcast_skills_taxonomy(sample_orgs):
+    """
+    Retrieve/Create Lightcast Open Skills Taxonomy with fresh tags from its JSON source
+    """
+    recreate_tags(
+        get_lightcast_skills_taxonomy(),
+        lambda taxonomy: create_tags_from_json(taxonomy, LIGHTCAST_SKILLS_TAXONOMY_PATH),
+    )
+
+
+@phase(
+    "skewed_taxonomy", enabled=GENERATE_SKEWED_TAXONOMY,
+    config={"name": SKEWED_TAXONOMY_NAME, "shape": SKEWED_TAXONOMY_SHAPE},
+)
+def create_skewed_taxonomy(sample_orgs):
+    """
+    Retrieve/Create skewed Taxonomy with fresh tags
+    """
+    recreate_tags(get_skewed_taxonomy(), create_tags_for_skewed_taxonomy)
+
+
+@phase(
+    "wgu_taxonomy", enabled=IMPORT_WGU_TAXONOMY,
+    sources=[WGU_TAXONOMY_PATH],
+    config={"name": WGU_TAXONOMY_NAME},
+)
+def import_wgu_taxonomy(sample_orgs):
+    """
+    Create/update WGU Instructional Design Taxonomy from its CSV source
+    """
+    wgu_taxonomy = get_wgu_taxonomy()
+    # Source: https://osmt.wgu.edu/api/collections/85c93bc0-e0c1-4b7d-8511-ce559e70f4cd
+    with open(WGU_TAXONOMY_PATH, "rb") as file_handle:
+        result = import_api.import_tags(wgu_taxonomy, file_handle, parser_format=import_api.ParserFormat.CSV, replace=True)
+    if not result:
+        print(import_api.get_last_import_log(wgu_taxonomy))
+        raise Exception("Failed to import WGU taxonomy")
+
+
+@phase(
+    "org_taxonomies",
+    config={
+        **SAMPLE_ORGS_CONFIG,
+        "names": (
+            DISABLED_TAXONOMY_NAME, FLAT_TAXONOMY_NAME,
+            HIERARCHICAL_TAXONOMY_NAME, TWO_LEVEL_TAXONOMY_NAME,
+        ),
+        "shapes": (
+            DISABLED_TAXONOMY_TAGS_COUNT, FLAT_TAXONOMY_TAGS_COUNT,
+            (HIERARCHICAL_TAXONOMY_MAX_LEVELS, HIERARCHICAL_TAXONOMY_TAGS_MULTIPLIER),
+            (TWO_LEVEL_TAXONOMY_MAX_LEVELS, TWO_LEVEL_TAXONOMY_TAGS_MULTIPLIER),
+        ),
+    },
+)
+def create_org_taxonomies(sample_orgs):
+    """
+    Retrieve/Create the Taxonomies of each org with fresh tags:
+    a disabled Taxonomy with 10 tags, a flat Taxonomy with 5000 tags,
+    a hierarchical Taxonomy with three levels and 4^x tags per level
+    (4 root tags, each with 16 child tags, each with 64 grandchild tags)
+    and a two level Taxonomy with 2 tag each level
+    """
+    for org in sample_orgs:
+        disabled_taxonomy, flat_taxonomy, hierarchical_taxonomy, two_level_taxonomy = get_org_taxonomies(org)
+        recreate_tags(disabled_taxonomy, create_tags_for_disabled_taxonomy)
+        recreate_tags(flat_taxonomy, create_tags_for_flat_taxonomy)
+        recreate_tags(hierarchical_taxonomy, create_tags_for_hierarchical_taxonomy)
+        recreate_tags(two_level_taxonomy, create_tags_for_two_level_taxonomy)
+
+
+@phase(
+    "course_import",
+    sources=[TARFILE_PATH],
+    config={**SAMPLE_ORGS_CONFIG, "course": (COURSE_NAME, COURSE_NUMBER, COURSE_RUN)},
+)
+def import_sample_courses(sample_orgs):
+    """
+    Retrieve/Create Sample Taxonomy Course in each org and populate it with imported course data
+    """
+    for org in sample_orgs:
+        logger.info(
+            f"Generating or retrieving Sample Taxonomy Courses for {org.short_name}..."
+        )
+        with store.default_store(ModuleStoreEnum.Type.split):
+            course_key = store.make_course_key(
+                org.short_name, COURSE_NUMBER, COURSE_RUN
+            )
+            if store.get_course(course_key):
+                logger.info(f"Found Sample Taxonomy Course in {org}")
+            else:
+                fields = {
+                    "display_name": COURSE_NAME
+                }
+                create_new_course_in_store(
+                    ModuleStoreEnum.Type.split,
+                    user,
+                    org.short_name,
+                    COURSE_NUMBER,
+                    COURSE_RUN,
+                    fields
                 )
-                for child in unit.get_children():
-                    logger.info(f"Tagging {child.location}")
-                    tagify_object(
-                        child.location,
-                        generated_taxonomies
-                    )
+                logger.info(f"Created Sample Taxonomy Course in {org}")
+
+        logger.info(f"Importing OLX data to Sample Taxonomy Course in {org}")
+        # Raise so the phase isn't recorded as successful and runs again next time
+        if not import_tarfile_in_course(TARFILE_PATH, course_key, user.id):
+            raise Exception(f"Failed to import OLX data to Sample Taxonomy Course in {org}")
+
+
+@phase(
+    "tagging",
+    config=GENERATED_TAXONOMIES_CONFIG,
+    upstream=GENERATED_TAXONOMIES_PHASES + ["course_import"],
+)
+def tag_sample_courses(sample_orgs):
+    """
+    Tag the Sample Taxonomy Course of each org and all the components it contains
+    """
+    for org in sample_orgs:
+        generated_taxonomies = get_generated_taxonomies(org, sample_orgs)
+        sample_taxonomy_course = store.get_course(
+            store.make_course_key(org.short_name, COURSE_NUMBER, COURSE_RUN)
+        )
+        if sample_taxonomy_course is None:
+            raise Exception(
+                f"Sample Taxonomy Course not found in {org}, "
+                "re-run it with GENERATE_PHASES=course_import"
+            )
+
+        # Tag course, units (vertical xblocks) and components inside units
+        # with one of each tag in taxonomies created above
+        object_ids = [sample_taxonomy_course.id]
+        for section in get_sections(sample_taxonomy_course):
+            for subsection in get_subsections(section):
+                for unit in get_units(subsection):
+                    object_ids.append(unit.location)
+                    object_ids += [child.location for child in unit.get_children()]
+
+        logger.info(f"Tagging {len(object_ids)} blocks in {org}")
+        progress = ProgressReporter(f"Tagging {org.short_name}", total=len(object_ids))
+        for object_id in object_ids:
+            logger.debug("Tagging %s", object_id)
+            progress.update(written=tagify_object(object_id, generated_taxonomies))
+        progress.report()
+
+
+@phase(
+    "load_test_object_tags", enabled=GENERATE_LOAD_TEST_OBJECT_TAGS,
+    config={
+        **GENERATED_TAXONOMIES_CONFIG,
+        "course_run": COURSE_RUN,
+        "load_test": (
+            LOAD_TEST_COURSE_NUMBER_PREFIX, LOAD_TEST_COURSES_PER_ORG,
+            LOAD_TEST_BLOCKS_PER_COURSE, LOAD_TEST_BLOCK_TYPES,
+            LOAD_TEST_TAGS_PER_OBJECT, LOAD_TEST_MAX_TAGS_PER_OBJECT,
+        ),
+    },
+    upstream=GENERATED_TAXONOMIES_PHASES,
+)
+def create_load_test_object_tags(sample_orgs):
+    """
+    Create fresh synthetic ObjectTags for each org
+    """
+    for org in sample_orgs:
+        generated_taxonomies = get_generated_taxonomies(org, sample_orgs)
+
+        # Clear any existing synthetic ObjectTags for org and create fresh ones
+        logger.info(f"Clearing existing load test ObjectTags for {org}")
+        # Prefix lookups, so the object_id index is used on large tables
+        ObjectTag.objects.filter(
+            Q(object_id__startswith=f"course-v1:{org.short_name}+{LOAD_TEST_COURSE_NUMBER_PREFIX}")
+            | Q(object_id__startswith=f"block-v1:{org.short_name}+{LOAD_TEST_COURSE_NUMBER_PREFIX}")
+        ).delete()
+
+        logger.info(f"Creating load test ObjectTags for {org}")
+        taxonomies_leaf_tags = get_taxonomies_leaf_tags(
+            [taxonomy for taxonomy in generated_taxonomies if taxonomy.enabled]
+        )
+        progress = ProgressReporter(
+            f"Load test ObjectTags {org.short_name}",
+            total=estimate_load_test_object_tags(taxonomies_leaf_tags),
+            unit="ObjectTags", written_unit=None,
+        )
+        written = bulk_create_object_tags(
+            generate_load_test_object_tags(org, taxonomies_leaf_tags, seed=org.id),
+            LOAD_TEST_BATCH_SIZE,
+            progress=progress,
+        )
+        progress.report()
+        logger.info(f"Created {written} load test ObjectTags for {org}")
+
+
+# Plan the phases to run: all of them for GENERATE_FULL_RESET, otherwise the
+# ones selected in GENERATE_PHASES, the ones whose inputs changed since their
+# last successful run, and their downstream phases
+phases_state = load_phases_state()
+planned_phases = plan_phases(GENERATE_PHASES, phases_state, full_reset=GENERATE_FULL_RESET)
+logger.info(f"Phases to run: {', '.join(planned_phases) or 'none, everything is up to date'}")
+
+# Validate the taxonomy sources to import, so a bad source fails before any write
+taxonomy_sources = []
+if "open_canada_taxonomy" in planned_phases:
+    taxonomy_sources.append(("Open Canada", OPEN_CANADA_TAXONOMY_PATH, find_json_taxonomy_conflicts))
+if "lightcast_skills_taxonomy" in planned_phases:
+    taxonomy_sources.append(("Lightcast", LIGHTCAST_SKILLS_TAXONOMY_PATH, find_json_taxonomy_conflicts))
+if "wgu_taxonomy" in planned_phases:
+    taxonomy_sources.append(("WGU", WGU_TAXONOMY_PATH, find_csv_taxonomy_conflicts))
+
+logger.info("Validating taxonomy sources...")
+validate_taxonomy_sources(taxonomy_sources)
+
+# Generate sample organizations or retrieve them if they already exist
+logger.info("Generating or retrieving sample Organizations...")
+sample_orgs = []
+for i in range(1, SAMPLE_ORGS_COUNT+1):
+    org, created = Organization.objects.get_or_create(
+        name=f"{SAMPLE_ORG_NAME}{i}",
+        short_name=f"{SAMPLE_ORG_NAME}{i}"
+    )
+    logger.info(f"{'Created' if created else 'Retrieved'} {org}")
+    sample_orgs.append(org)
+
+store = modulestore()
+
+run_phases(planned_phases, phases_state, sample_orgs)